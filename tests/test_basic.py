@@ -1,7 +1,18 @@
+from decimal import Decimal
+
+import pytest
+from mysql.connector import MySQLConnection
+from mysql.connector.errors import InternalError, PoolError
+from mysql.connector.pooling import MySQLConnectionPool
+
 from turboindex import __version__
 from turboindex import rewriter
 from turboindex import index_recommender
 from turboindex import profiler
+from turboindex import config as app_config
+from turboindex import plan_cache
+from turboindex import pool
+from turboindex import reporting
 
 
 def test_version_string():
@@ -19,6 +30,114 @@ def test_rewriter_or_to_in():
     sql = "SELECT * FROM t WHERE status = 'a' OR status = 'b' OR status = 'c'"
     result = rewriter.rewrite_query(sql, mode="safe")
     assert "IN (" in result.rewritten_sql
+    assert result.rewritten_sql.endswith("WHERE status IN ('a', 'b', 'c')")
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        # AND, XOR and other operators bind tighter than OR.
+        ("SELECT * FROM t WHERE a = 1 OR a = 2 AND b = 3", None),
+        ("SELECT * FROM t WHERE a = 1 OR a = 2 XOR b = 3", None),
+        ("SELECT * FROM t WHERE a = 1 OR a = 2 + 1", None),
+        ("SELECT * FROM t WHERE a = f(1) OR a = f(2)", None),
+        # The chain stops where the column changes.
+        ("SELECT * FROM t WHERE a = 1 OR a = 2 OR b = 3", "SELECT * FROM t WHERE a IN (1, 2) OR b = 3"),
+        ("SELECT * FROM t WHERE a = 1 OR b = 2 OR a = 3", None),
+        # Column names are case-insensitive.
+        ("SELECT * FROM t WHERE a = 1 OR A = 2", "SELECT * FROM t WHERE a IN (1, 2)"),
+        # Clause boundaries.
+        ("SELECT * FROM t WHERE a = 1 OR a = 2;", "SELECT * FROM t WHERE a IN (1, 2);"),
+        ("SELECT * FROM t WHERE a = 1 OR a = 2 ORDER BY a", "SELECT * FROM t WHERE a IN (1, 2) ORDER BY a"),
+        # Nested and multiple WHERE clauses are handled independently.
+        (
+            "SELECT * FROM t WHERE id IN (SELECT id FROM u WHERE a = 1 OR a = 2)",
+            "SELECT * FROM t WHERE id IN (SELECT id FROM u WHERE a IN (1, 2))",
+        ),
+        (
+            "SELECT * FROM t WHERE a = 1 OR a = 2 AND id IN (SELECT id FROM u WHERE b = 1 OR b = 2)",
+            "SELECT * FROM t WHERE a = 1 OR a = 2 AND id IN (SELECT id FROM u WHERE b IN (1, 2))",
+        ),
+        (
+            "SELECT x FROM t WHERE a = 1 OR a = 2 UNION SELECT x FROM u WHERE b = 3 OR b = 4",
+            "SELECT x FROM t WHERE a IN (1, 2) UNION SELECT x FROM u WHERE b IN (3, 4)",
+        ),
+    ],
+)
+def test_rewriter_or_to_in_respects_precedence(sql, expected):
+    result = rewriter.rewrite_query(sql, mode="safe")
+    assert result.rewritten_sql == (sql if expected is None else expected)
+
+
+_NOT_EQ_NULL = rewriter._CHANGE_NOT_EQ_NULL
+_EQ_NULL = rewriter._CHANGE_EQ_NULL
+_OR_TO_IN = rewriter._CHANGE_OR_TO_IN
+_YEAR_RANGE = rewriter._CHANGE_YEAR_RANGE
+
+# Regression corpus for the safe rules: (sql, rewritten_sql, changes).
+# Each kind of change is reported once, in a fixed order that does not
+# depend on where it occurs in the query.
+_SAFE_REWRITE_CORPUS = [
+    ("SELECT * FROM users WHERE deleted != NULL", "SELECT * FROM users WHERE deleted IS NOT NULL", [_NOT_EQ_NULL]),
+    ("SELECT * FROM t WHERE a = NULL OR a = 1", "SELECT * FROM t WHERE a IS NULL OR a = 1", [_EQ_NULL]),
+    ("SELECT * FROM t WHERE a = NULL AND b = NULL", "SELECT * FROM t WHERE a IS NULL AND b IS NULL", [_EQ_NULL]),
+    (
+        "SELECT * FROM t WHERE a = 1 OR a = 2 OR a = NULL",
+        "SELECT * FROM t WHERE a IN (1, 2) OR a IS NULL",
+        [_EQ_NULL, _OR_TO_IN],
+    ),
+    (
+        "SELECT * FROM t WHERE YEAR(d) = 2020 AND a = NULL AND b != NULL",
+        "SELECT * FROM t WHERE d >= '2020-01-01' AND d < '2021-01-01' AND a IS NULL AND b IS NOT NULL",
+        [_NOT_EQ_NULL, _EQ_NULL, _YEAR_RANGE],
+    ),
+    (
+        "SELECT * FROM orders WHERE YEAR(created_at) = 2024",
+        "SELECT * FROM orders WHERE created_at >= '2024-01-01' AND created_at < '2025-01-01'",
+        [_YEAR_RANGE],
+    ),
+    (
+        "SELECT a FROM t WHERE b = 1 OR b = 2 AND YEAR(c) = 2020 ORDER BY a",
+        "SELECT a FROM t WHERE b = 1 OR b = 2 AND c >= '2020-01-01' AND c < '2021-01-01' ORDER BY a",
+        [_YEAR_RANGE],
+    ),
+    ("SELECT * FROM t WHERE t.a = 1 OR t.a = 2 GROUP BY x", "SELECT * FROM t WHERE t.a IN (1, 2) GROUP BY x", [_OR_TO_IN]),
+    ("SELECT * FROM t WHERE a = 1\n  OR a = 2\tOR a=3", "SELECT * FROM t WHERE a IN (1, 2, 3)", [_OR_TO_IN]),
+    ("SELECT * FROM t WHERE a = 'x y' OR a = 2", "SELECT * FROM t WHERE a = 'x y' OR a = 2", []),
+    # Lowercase and mixed-case SQL is matched through an uppercased copy;
+    # untouched text keeps its original case.
+    ("select * from t where a = null", "select * from t where a IS NULL", [_EQ_NULL]),
+    (
+        "select * from t where year(d)=2023 and YEAR(e) = 1999",
+        "select * from t where d >= '2023-01-01' AND d < '2024-01-01' and e >= '1999-01-01' AND e < '2000-01-01'",
+        [_YEAR_RANGE],
+    ),
+    ("Select * From t Where a = 1 Or A = 2", "Select * From t WHERE a IN (1, 2)", [_OR_TO_IN]),
+    # NULLs spelled only as IS [NOT] NULL skip the regex; others do not.
+    ("SELECT 1 FROM t WHERE x IS NULL", "SELECT 1 FROM t WHERE x IS NULL", []),
+    ("SELECT * FROM t WHERE a IS NULL AND b IS NOT NULL", "SELECT * FROM t WHERE a IS NULL AND b IS NOT NULL", []),
+    ("SELECT * FROM t WHERE a IS NULL AND b = NULL", "SELECT * FROM t WHERE a IS NULL AND b IS NULL", [_EQ_NULL]),
+    ("SELECT * FROM t WHERE a IS  NULL", "SELECT * FROM t WHERE a IS  NULL", []),
+    ("SELECT * FROM t WHERE a <=> NULL", "SELECT * FROM t WHERE a <=> NULL", []),
+    # Characters that expand when uppercased ("ß" -> "SS") must not shift
+    # offsets into the original SQL.
+    (
+        "SELECT * FROM straße WHERE ß = NULL OR YEAR(ß) = 2020",
+        "SELECT * FROM straße WHERE ß IS NULL OR ß >= '2020-01-01' AND ß < '2021-01-01'",
+        [_EQ_NULL, _YEAR_RANGE],
+    ),
+    ("SELECT 'ßß' FROM t WHERE a = 1 OR a = 2", "SELECT 'ßß' FROM t WHERE a IN (1, 2)", [_OR_TO_IN]),
+    ("SELECT * FROM t WHERE ß = 1 OR ß = 2", "SELECT * FROM t WHERE ß IN (1, 2)", [_OR_TO_IN]),
+    ("SELECT * FROM t", "SELECT * FROM t", []),
+    ("", "", []),
+]
+
+
+@pytest.mark.parametrize("sql, rewritten_sql, changes", _SAFE_REWRITE_CORPUS)
+def test_rewriter_safe_corpus(sql, rewritten_sql, changes):
+    result = rewriter.rewrite_query(sql, mode="safe")
+    assert result.rewritten_sql == rewritten_sql
+    assert list(result.changes) == changes
 
 
 def test_rewriter_year_function_to_range():
@@ -40,12 +159,20 @@ def test_rewriter_select_star_with_columns_helper():
     assert any("SELECT *" in c.description or "explicit column" in c.description for c in changes)
 
 
+def test_rewriter_select_star_with_leading_whitespace():
+    # Padding pushes SELECT past the sniffed prefix; the regex still applies.
+    sql = " " * 28 + "SELECT * FROM users"
+    changes: list[rewriter.RewriteChange] = []
+    rewritten = rewriter._rewrite_select_star_with_columns(sql, changes, lambda table: ["id", "name"])
+    assert "SELECT id, name FROM users" in rewritten
+    assert changes
+
+
 def test_index_health_penalizes_full_scan():
     explain_rows = [
         {"table": "orders", "type": "ALL", "Extra": "Using where"},
     ]
-    recommendations: list[index_recommender.IndexRecommendation] = []
-    score, issues = index_recommender._compute_index_health(explain_rows, recommendations)
+    _, score, issues = index_recommender._score_and_recommend(explain_rows)
     assert score < 100
     assert any("Full table scan" in issue for issue in issues)
 
@@ -55,8 +182,8 @@ def test_query_profile_result_metrics():
         profiler.ExplainRow(raw={"rows": 42, "Extra": "Using filesort; Using temporary"}),
     ]
     samples = [
-        profiler.QueryExecutionSample(iteration=1, execution_time_ms=10.0, rows_returned=5),
-        profiler.QueryExecutionSample(iteration=2, execution_time_ms=20.0, rows_returned=15),
+        profiler.QueryExecutionSample(iteration=1, execution_time_ns=10_000_000, rows_returned=5),
+        profiler.QueryExecutionSample(iteration=2, execution_time_ns=20_000_000, rows_returned=15),
     ]
     result = profiler.QueryProfileResult(
         query="SELECT * FROM t",
@@ -67,7 +194,369 @@ def test_query_profile_result_metrics():
     )
 
     data = result.to_dict()
+    assert data["average_time_ms"] == 15.0
+    assert data["samples"][0]["execution_time_ms"] == 10.0
     assert data["estimated_rows_examined"] == 42
     assert data["uses_filesort"] is True
     assert data["uses_temporary"] is True
     assert data["query_metrics"]["filesort_operations"] == 1
+
+
+class _FakeCursor:
+    def __init__(self, rows, executed):
+        self.rows = rows
+        self.executed = executed
+        self.closed = False
+        self._pending = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        self._pending = list(self.rows)
+
+    def _take(self):
+        batch, self._pending = self._pending, []
+        return batch
+
+    def fetchall(self):
+        return self._take()
+
+    def fetchmany(self, size):
+        return self._take()
+
+    def __iter__(self):
+        return iter(self._take())
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeConnection:
+    def __init__(self, rows, executed, cursors):
+        self.rows = rows
+        self.executed = executed
+        self.cursors = cursors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self, **kwargs):
+        cursor = _FakeCursor(self.rows, self.executed)
+        self.cursors.append(cursor)
+        return cursor
+
+
+def _patch_connect(monkeypatch, module, rows):
+    """Make `module.connect` return fake connections whose cursors yield `rows`.
+
+    Returns the (sql, params) pairs executed and the cursors opened, shared
+    by every connection.
+    """
+
+    executed = []
+    cursors = []
+    monkeypatch.setattr(module, "connect", lambda config: _FakeConnection(rows, executed, cursors))
+    return executed, cursors
+
+
+def test_profile_query_parallel_binds_params(monkeypatch):
+    rows = [{"table": "users", "type": "ref", "rows": 1, "key": "PRIMARY", "Extra": None}]
+    executed, cursors = _patch_connect(monkeypatch, profiler, rows)
+
+    splits = []
+    run_iterations = profiler._run_iterations
+
+    def recording_run_iterations(config, query, bind, prepared, iterations):
+        splits.append(list(iterations))
+        return run_iterations(config, query, bind, prepared, iterations)
+
+    monkeypatch.setattr(profiler, "get_server_version", lambda conn: "8.0.36")
+    monkeypatch.setattr(profiler, "_run_iterations", recording_run_iterations)
+
+    query = "SELECT * FROM users WHERE id = %s"
+    result = profiler.profile_query(
+        query, "localhost", 3306, None, None, "app",
+        iterations=5, pool_size=2, params=["7"], parallel=True,
+    )
+
+    assert sorted(splits) == [[1, 3, 5], [2, 4]]
+    assert [sample.iteration for sample in result.samples] == [1, 2, 3, 4, 5]
+    assert [sample.rows_returned for sample in result.samples] == [1] * 5
+    assert executed.count(("EXPLAIN " + query, ("7",))) == 1
+    assert executed.count((query, ("7",))) == 5
+    assert all(cursor.closed for cursor in cursors)
+
+
+def test_load_config_pool_size_from_env(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TURBOINDEX_POOL_SIZE", "4")
+    cfg = app_config.load_config()
+    assert cfg.pool_size == 4
+
+
+def test_load_config_rejects_out_of_range_pool_size(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for value in ("0", "33", "many"):
+        monkeypatch.setenv("TURBOINDEX_POOL_SIZE", value)
+        with pytest.raises(ValueError, match="(?i)pool_size"):
+            app_config.load_config()
+
+
+def test_plan_cache_roundtrip(tmp_path):
+    cache = plan_cache.QueryCache(path=tmp_path / "plans.sqlite")
+    key = plan_cache.plan_key("SELECT * FROM t;", "localhost:3306/db@8.0")
+    assert key == plan_cache.plan_key("  SELECT * FROM t", "localhost:3306/db@8.0")
+    assert key != plan_cache.plan_key("SELECT * FROM t", "localhost:3306/db@8.0", [1])
+    assert cache.get(key) is None
+
+    rows = [{"table": "t", "type": "ALL", "rows": 10}]
+    cache.put(key, rows, [("db", "t")], "abc")
+    assert cache.get(key) == (rows, [("db", "t")], "abc")
+
+
+def test_plan_cache_corrupt_entry_is_a_miss(tmp_path):
+    cache = plan_cache.QueryCache(path=tmp_path / "plans.sqlite")
+    cache.put("k", [], [], "abc")
+    cache._connect().execute("UPDATE plan_entries SET rows = '{not json'")
+    assert cache.get("k") is None
+
+
+class _FakeExplainCursor:
+    """Dictionary cursor answering EXPLAIN, SHOW WARNINGS and fingerprint queries."""
+
+    def __init__(self, note, statistics):
+        self.note = note
+        self.statistics = statistics
+        self.executed = []
+        self._result = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if sql.startswith("EXPLAIN"):
+            self._result = [{"table": "u", "type": "ref", "rows": 1}]
+        elif sql == "SHOW WARNINGS":
+            self._result = [{"Level": "Note", "Code": 1003, "Message": self.note}] if self.note else []
+        else:
+            self._result = [row for row in self.statistics if row[:2] in zip(params[::2], params[1::2])]
+
+    def fetchall(self):
+        return self._result
+
+
+def test_cached_explain_fingerprints_only_the_plan_tables(tmp_path):
+    cache = plan_cache.QueryCache(path=tmp_path / "plans.sqlite")
+    statistics = [("app", "users", "PRIMARY", "id"), ("app", "logs", "PRIMARY", "id")]
+    note = "/* select#1 */ select `app`.`u`.`id` AS `id` from `app`.`users` `u`"
+    cursor = _FakeExplainCursor(note, statistics)
+
+    query = "SELECT id FROM users u"
+    rows = plan_cache.cached_explain(cursor, query, cache, "db@8.0")
+    assert [sql for sql, _ in cursor.executed][:2] == ["EXPLAIN " + query, "SHOW WARNINGS"]
+
+    cursor.executed.clear()
+    assert plan_cache.cached_explain(cursor, query, cache, "db@8.0") == rows
+    assert [params for _, params in cursor.executed] == [("app", "users", "app", "users")]
+
+    # Changes to other tables keep the entry; an index on `users` does not.
+    statistics.append(("app", "logs", "idx_level", "level"))
+    cursor.executed.clear()
+    plan_cache.cached_explain(cursor, query, cache, "db@8.0")
+    assert not any(sql.startswith("EXPLAIN") for sql, _ in cursor.executed)
+
+    statistics.append(("app", "users", "idx_email", "email"))
+    cursor.executed.clear()
+    plan_cache.cached_explain(cursor, query, cache, "db@8.0")
+    assert cursor.executed[1][0] == "EXPLAIN " + query
+
+
+def test_cached_explain_skips_plans_without_table_note(tmp_path):
+    cache = plan_cache.QueryCache(path=tmp_path / "plans.sqlite")
+    cursor = _FakeExplainCursor(None, [])
+    plan_cache.cached_explain(cursor, "SELECT id FROM users", cache, "db")
+    assert cache.get(plan_cache.plan_key("SELECT id FROM users", "db")) is None
+
+
+def test_score_and_recommend_single_pass():
+    explain_rows = [
+        {"table": "orders", "type": "ALL", "Extra": "Using where; Using filesort"},
+        {"table": "customers", "type": "index", "Extra": "Using temporary"},
+    ]
+    recommendations, score, issues = index_recommender._score_and_recommend(explain_rows)
+    assert [r.table for r in recommendations] == ["orders"]
+    assert score == 100 - 20 - 10 - 5 - 10 - 5
+    assert issues[-1] == "1 index recommendation(s) suggested"
+
+
+def test_load_config_picks_up_toml_changes(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("TURBOINDEX_HOST", raising=False)
+    config_file = tmp_path / "turboindex.toml"
+
+    config_file.write_text('[mysql]\nhost = "db1"\n')
+    assert app_config.load_config().host == "db1"
+
+    config_file.write_text('[mysql]\nhost = "db-replica"\n')
+    assert app_config.load_config().host == "db-replica"
+
+
+def test_rewrite_with_connection_caches_columns(monkeypatch):
+    calls = []
+
+    def fake_columns(config, table):
+        calls.append(table)
+        return ["id", "name"]
+
+    monkeypatch.setattr(rewriter, "_get_columns_for_table_from_db", fake_columns)
+    rewriter.clear_column_cache()
+    for _ in range(2):
+        result = rewriter.rewrite_query_with_connection(
+            "SELECT * FROM users", "moderate", None, None, None, None, "app"
+        )
+        assert result.rewritten_sql == "SELECT id, name FROM users"
+    assert calls == ["users"]
+    rewriter.clear_column_cache()
+
+
+def test_prefetch_columns_single_query(monkeypatch):
+    rows = [("orders", "id"), ("orders", "total"), ("users", "id")]
+    executed, _ = _patch_connect(monkeypatch, rewriter, rows)
+
+    def unexpected_lookup(config, table):
+        raise AssertionError(f"unexpected SHOW COLUMNS for {table}")
+
+    monkeypatch.setattr(rewriter, "_get_columns_for_table_from_db", unexpected_lookup)
+    rewriter.clear_column_cache()
+
+    config = rewriter.MySQLConnectionConfig(database="app")
+    rewriter.prefetch_columns(config, ["users", "orders", "users", "bad-name"])
+    assert [params for _, params in executed] == [("app", "orders", "users")]
+
+    result = rewriter.rewrite_query_with_connection(
+        "SELECT * FROM orders", "moderate", None, None, None, None, "app"
+    )
+    assert result.rewritten_sql == "SELECT id, total FROM orders"
+    rewriter.clear_column_cache()
+
+
+def test_prefetched_columns_are_bounded(monkeypatch):
+    _patch_connect(monkeypatch, rewriter, [("a", "id"), ("b", "id"), ("c", "id")])
+    monkeypatch.setattr(rewriter, "_PREFETCHED_COLUMNS_MAX", 2)
+    rewriter.clear_column_cache()
+
+    rewriter.prefetch_columns(rewriter.MySQLConnectionConfig(database="app"), ["a", "b", "c"])
+    assert [key[-1] for key in rewriter._prefetched_columns] == ["b", "c"]
+    rewriter.clear_column_cache()
+
+
+def test_rewrite_query_results_are_cached():
+    sql = "SELECT * FROM users WHERE deleted = NULL"
+    result = rewriter.rewrite_query(sql, mode="safe")
+    assert rewriter.rewrite_query(sql, mode="SAFE") is result
+    assert isinstance(result.changes, tuple)
+
+
+class _FakeMySQLConnection(MySQLConnection):
+    """Unconnected driver connection that records what the pool does to it."""
+
+    def __init__(self, rollback_error=None):
+        super().__init__()
+        self.events = []
+        self.rollback_error = rollback_error
+
+    def is_connected(self):
+        return "disconnect" not in self.events
+
+    @property
+    def in_transaction(self):
+        return True
+
+    def rollback(self):
+        if self.rollback_error is not None:
+            raise self.rollback_error
+        self.events.append("rollback")
+
+    def disconnect(self):
+        self.events.append("disconnect")
+
+
+def _fake_pool(monkeypatch, pool_size=2, **fake_kwargs):
+    opened = []
+
+    def fake_connect(**kwargs):
+        cnx = _FakeMySQLConnection(**fake_kwargs)
+        opened.append(cnx)
+        return cnx
+
+    monkeypatch.setattr(pool, "connect", fake_connect)
+    return pool.ConnectionPool(pool_size, host="db"), opened
+
+
+def test_connection_pool_opens_connections_lazily(monkeypatch):
+    cpool, opened = _fake_pool(monkeypatch)
+    assert opened == []
+
+    first = cpool.get_connection()
+    first.close()
+    again = cpool.get_connection()
+    assert len(opened) == 1 and cpool._opened == 1
+
+    second = cpool.get_connection()
+    assert len(opened) == 2 and cpool._opened == 2
+    with pytest.raises(PoolError):
+        cpool.get_connection()
+    again.close()
+    second.close()
+
+
+def test_connection_pool_releases_slot_when_connect_fails(monkeypatch):
+    cpool, _ = _fake_pool(monkeypatch)
+
+    def failing_connect(**kwargs):
+        raise InternalError("connection refused")
+
+    monkeypatch.setattr(pool, "connect", failing_connect)
+    with pytest.raises(InternalError):
+        cpool.get_connection()
+    assert cpool._opened == 0
+
+
+def test_connection_pool_rolls_back_returned_connections(monkeypatch):
+    cpool, opened = _fake_pool(monkeypatch)
+    cpool.get_connection().close()
+    assert opened[0].events == ["rollback"]
+
+
+def test_connection_pool_disconnects_when_rollback_fails(monkeypatch):
+    cpool, opened = _fake_pool(monkeypatch, rollback_error=InternalError("Unread result found"))
+    cpool.get_connection().close()
+    assert opened[0].events == ["disconnect"]
+    assert cpool._opened == 1
+
+
+@pytest.mark.parametrize("driver_removes", [True, False])
+def test_connection_pool_close_disconnects_idle(monkeypatch, driver_removes):
+    if not driver_removes:
+        monkeypatch.delattr(MySQLConnectionPool, "_remove_connections")
+    cpool, opened = _fake_pool(monkeypatch)
+    idle = cpool.get_connection()
+    busy = cpool.get_connection()
+    idle.close()
+
+    cpool.close()
+    assert cpool._opened == 1
+    assert opened[0].events[-1] == "disconnect"
+    assert "disconnect" not in opened[1].events
+    busy.close()
+
+
+@pytest.mark.parametrize("tty, expected", [
+    (False, '{"a":1,"b":["é","1.5"]}'),
+    (True, '{\n  "a": 1,\n  "b": [\n    "é",\n    "1.5"\n  ]\n}'),
+])
+def test_dumps_json_fallback_matches_orjson(monkeypatch, tty, expected):
+    # Piped output must not depend on whether the [fast] extra is installed.
+    monkeypatch.setattr(reporting, "orjson", None)
+    monkeypatch.setattr(reporting.sys.stdout, "isatty", lambda: tty)
+    assert reporting._dumps({"a": 1, "b": ["é", Decimal("1.5")]}) == expected
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Any, Tuple
+
+
+class FrozenSlots:
+    """Base for frozen dataclasses that declare their own `__slots__`.
+
+    Subclasses list their slots explicitly because dataclass(slots=True)
+    needs Python 3.10. Frozen instances with __slots__ cannot be restored
+    attribute by attribute (copy, pickle), so they are rebuilt through
+    __init__ from their fields instead.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        return (type(self), tuple(getattr(self, f.name) for f in fields(self)))
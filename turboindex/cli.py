@@ -1,13 +1,15 @@
 import argparse
 import sys
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from . import __version__
-from . import profiler
-from . import rewriter
-from . import index_recommender
-from . import reporting
-from . import config as app_config
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import TurboIndexConfig
+    from .connection import MySQLConnectionConfig
+
+# Subcommand modules are imported inside main() so that `--version`,
+# `--help` and `rewrite` do not pay for mysql.connector and rich.
 
 
 def _add_connection_arguments(parser: argparse.ArgumentParser) -> None:
@@ -18,21 +20,7 @@ def _add_connection_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--database", required=False, help="MySQL database name")
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="turboindex",
-        description="TurboIndex - MySQL query optimization toolkit",
-    )
-    parser.add_argument(
-        "--version",
-        action="version",
-        version=f"turboindex {__version__}",
-        help="Show TurboIndex version and exit",
-    )
-
-    subparsers = parser.add_subparsers(dest="command", required=True)
-
-    # profile
+def _add_profile_command(subparsers) -> None:
     profile_p = subparsers.add_parser(
         "profile",
         help="Profile a SQL query against a MySQL database",
@@ -45,12 +33,44 @@ def build_parser() -> argparse.ArgumentParser:
         default=3,
         help="Number of times to run the query for timing (default: 3)",
     )
+    profile_p.add_argument(
+        "--param",
+        dest="params",
+        metavar="VALUE",
+        action="append",
+        default=[],
+        help="Value bound to the next %%s placeholder in --query (repeatable)",
+    )
+    profile_p.add_argument(
+        "--prepared",
+        action="store_true",
+        help="Run iterations as a server-side prepared statement",
+    )
+    concurrency = profile_p.add_mutually_exclusive_group()
+    concurrency.add_argument(
+        "--parallel",
+        dest="parallel",
+        action="store_true",
+        help="Spread iterations across pooled connections (noisier timings)",
+    )
+    concurrency.add_argument(
+        "--serial",
+        dest="parallel",
+        action="store_false",
+        help="Run iterations one after another on one connection (default)",
+    )
     profile_p.add_argument(
         "--format",
         choices=["table", "json", "csv", "html"],
         default="table",
         help="Output format for profiling results (default: table)",
     )
+    profile_p.add_argument(
+        "--plan-cache",
+        dest="plan_cache",
+        action="store_true",
+        help="Reuse cached EXPLAIN output while the tables it reads are unchanged",
+    )
     profile_p.add_argument(
         "--mysql-version",
         dest="mysql_version",
@@ -61,7 +81,8 @@ def build_parser() -> argparse.ArgumentParser:
         ),
     )
 
-    # rewrite
+
+def _add_rewrite_command(subparsers) -> None:
     rewrite_p = subparsers.add_parser(
         "rewrite",
         help="Rewrite a SQL query using optimization rules",
@@ -81,7 +102,8 @@ def build_parser() -> argparse.ArgumentParser:
         help="Output format for rewrite results (default: diff)",
     )
 
-    # recommend-indexes
+
+def _add_recommend_indexes_command(subparsers) -> None:
     rec_p = subparsers.add_parser(
         "recommend-indexes",
         help="Analyze a query and recommend indexes",
@@ -94,6 +116,12 @@ def build_parser() -> argparse.ArgumentParser:
         default="table",
         help="Output format for index recommendations (default: table)",
     )
+    rec_p.add_argument(
+        "--plan-cache",
+        dest="plan_cache",
+        action="store_true",
+        help="Reuse cached EXPLAIN output while the tables it reads are unchanged",
+    )
     rec_p.add_argument(
         "--mysql-version",
         dest="mysql_version",
@@ -104,27 +132,95 @@ def build_parser() -> argparse.ArgumentParser:
         ),
     )
 
+
+_COMMANDS = {
+    "profile": _add_profile_command,
+    "rewrite": _add_rewrite_command,
+    "recommend-indexes": _add_recommend_indexes_command,
+}
+
+
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """Build the CLI parser.
+
+    When `command` names a subcommand, only that subparser is added; the
+    others would never be used for this invocation.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="turboindex",
+        description="TurboIndex - MySQL query optimization toolkit",
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"turboindex {__version__}",
+        help="Show TurboIndex version and exit",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    if command in _COMMANDS:
+        _COMMANDS[command](subparsers)
+    else:
+        for add_command in _COMMANDS.values():
+            add_command(subparsers)
+
     return parser
 
 
+def _resolve(args: argparse.Namespace, cfg: "TurboIndexConfig") -> "MySQLConnectionConfig":
+    """Merge CLI connection flags over config values; flags take precedence."""
+
+    from .connection import MySQLConnectionConfig
+
+    return MySQLConnectionConfig(
+        host=args.host or cfg.host or "localhost",
+        port=args.port or cfg.port or 3306,
+        user=args.user or cfg.user,
+        password=args.password or cfg.password,
+        database=args.database or cfg.database,
+        pool_size=cfg.pool_size,
+    )
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     if argv is None:
         argv = sys.argv[1:]
 
-    parser = build_parser()
+    if argv == ["--version"]:
+        print(f"turboindex {__version__}")
+        return 0
+
+    parser = build_parser(argv[0] if argv else None)
     args = parser.parse_args(argv)
 
-    if args.command == "profile":
+    from . import config as app_config
+
+    try:
         cfg = app_config.load_config()
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.command == "profile":
+        from . import plan_cache
+        from . import profiler
+        from . import reporting
+
+        conn = _resolve(args, cfg)
         result = profiler.profile_query(
             query=args.query,
-            host=args.host or cfg.host or "localhost",
-            port=args.port or cfg.port or 3306,
-            user=args.user or cfg.user,
-            password=args.password or cfg.password,
-            database=args.database or cfg.database,
+            host=conn.host,
+            port=conn.port,
+            user=conn.user,
+            password=conn.password,
+            database=conn.database,
             iterations=args.iterations,
             mysql_version=args.mysql_version or cfg.mysql_version,
+            pool_size=conn.pool_size,
+            plan_cache=plan_cache.QueryCache() if args.plan_cache else None,
+            params=args.params,
+            prepared=args.prepared,
+            parallel=args.parallel,
         )
         reporting.output_profile_result(result, fmt=args.format)
         return 0
@@ -132,19 +228,23 @@ def main(argv: Optional[list[str]] = None) -> int:
     if args.command == "rewrite":
         # If connection/config is available and mode is moderate/aggressive,
         # enable schema-aware rewrites like SELECT * -> explicit columns.
-        cfg = app_config.load_config()
-        have_dsn = any([args.host, args.port, args.user, args.password, args.database,
-                        cfg.host, cfg.port, cfg.user, cfg.password, cfg.database])
+        from . import reporting
+        from . import rewriter
+
+        have_dsn = any((args.host, args.port, args.user, args.password, args.database,
+                        cfg.host, cfg.port, cfg.user, cfg.password, cfg.database))
 
         if args.mode in {"moderate", "aggressive"} and have_dsn:
+            conn = _resolve(args, cfg)
             result = rewriter.rewrite_query_with_connection(
                 sql=args.query,
                 mode=args.mode,
-                host=args.host or cfg.host,
-                port=args.port or cfg.port,
-                user=args.user or cfg.user,
-                password=args.password or cfg.password,
-                database=args.database or cfg.database,
+                host=conn.host,
+                port=conn.port,
+                user=conn.user,
+                password=conn.password,
+                database=conn.database,
+                pool_size=conn.pool_size,
             )
         else:
             result = rewriter.rewrite_query(
@@ -155,15 +255,21 @@ def main(argv: Optional[list[str]] = None) -> int:
         return 0
 
     if args.command == "recommend-indexes":
-        cfg = app_config.load_config()
+        from . import index_recommender
+        from . import plan_cache
+        from . import reporting
+
+        conn = _resolve(args, cfg)
         result = index_recommender.analyze_query_indexes(
             query=args.query,
-            host=args.host or cfg.host or "localhost",
-            port=args.port or cfg.port or 3306,
-            user=args.user or cfg.user,
-            password=args.password or cfg.password,
-            database=args.database or cfg.database,
+            host=conn.host,
+            port=conn.port,
+            user=conn.user,
+            password=conn.password,
+            database=conn.database,
             mysql_version=args.mysql_version or cfg.mysql_version,
+            pool_size=conn.pool_size,
+            plan_cache=plan_cache.QueryCache() if args.plan_cache else None,
         )
         reporting.output_index_recommendations(result, fmt=args.format)
         return 0
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import functools
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 try:  # Python 3.11+
     import tomllib  # type: ignore[attr-defined]
@@ -11,6 +12,10 @@ except ModuleNotFoundError:  # pragma: no cover
     import tomli as tomllib  # type: ignore[no-redef]
 
 
+# mysql.connector's MySQLConnectionPool refuses larger pools.
+MAX_POOL_SIZE = 32
+
+
 @dataclass
 class TurboIndexConfig:
     host: Optional[str] = None
@@ -19,6 +24,17 @@ class TurboIndexConfig:
     password: Optional[str] = None
     database: Optional[str] = None
     mysql_version: Optional[str] = None
+    pool_size: Optional[int] = None
+
+
+def validate_pool_size(pool_size: object) -> int:
+    """Return `pool_size` if it is an integer from 1 to MAX_POOL_SIZE."""
+
+    if isinstance(pool_size, bool) or not isinstance(pool_size, int):
+        raise ValueError(f"pool_size must be an integer, got {pool_size!r}")
+    if not 1 <= pool_size <= MAX_POOL_SIZE:
+        raise ValueError(f"pool_size must be between 1 and {MAX_POOL_SIZE}, got {pool_size}")
+    return pool_size
 
 
 def _load_toml_file(path: Path) -> dict:
@@ -28,6 +44,17 @@ def _load_toml_file(path: Path) -> dict:
         return tomllib.load(f)
 
 
+_ENV_KEYS = (
+    "TURBOINDEX_HOST",
+    "TURBOINDEX_PORT",
+    "TURBOINDEX_USER",
+    "TURBOINDEX_PASSWORD",
+    "TURBOINDEX_DATABASE",
+    "TURBOINDEX_MYSQL_VERSION",
+    "TURBOINDEX_POOL_SIZE",
+)
+
+
 def load_config() -> TurboIndexConfig:
     """Load TurboIndex configuration from turboindex.toml and environment.
 
@@ -35,14 +62,38 @@ def load_config() -> TurboIndexConfig:
       1. turboindex.toml in the current working directory
       2. Environment variables (TURBOINDEX_*)
     Command-line flags still take ultimate precedence in the CLI.
+
+    The parsed result is cached until the file's mtime/size or one of the
+    TURBOINDEX_* variables changes. Raises ValueError for a pool_size
+    outside 1..MAX_POOL_SIZE.
     """
 
+    path = Path.cwd() / "turboindex.toml"
+    try:
+        stat = path.stat()
+        file_key: Optional[Tuple[int, int]] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+
+    environ = os.environ
+    env = tuple(environ.get(key) for key in _ENV_KEYS)
+
+    # Callers may modify the result, so hand out a copy of the cached one.
+    return replace(_build_config(str(path), file_key, env))
+
+
+@functools.lru_cache(maxsize=4)
+def _build_config(
+    path_str: str,
+    file_key: Optional[Tuple[int, int]],
+    env: Tuple[Optional[str], ...],
+) -> TurboIndexConfig:
     cfg = TurboIndexConfig()
 
     # 1) File-based config: ./turboindex.toml
     data: dict = {}
-    cwd_path = Path.cwd() / "turboindex.toml"
-    data = _load_toml_file(cwd_path)
+    if file_key is not None:
+        data = _load_toml_file(Path(path_str))
 
     mysql_section = data.get("mysql", {})
     if isinstance(mysql_section, dict):
@@ -54,33 +105,41 @@ def load_config() -> TurboIndexConfig:
         cfg.password = mysql_section.get("password") or cfg.password
         cfg.database = mysql_section.get("database") or cfg.database
         cfg.mysql_version = mysql_section.get("version") or cfg.mysql_version
+        pool_size = mysql_section.get("pool_size")
+        if pool_size is not None:
+            cfg.pool_size = validate_pool_size(pool_size)
 
     # 2) Environment variables override file
-    host = os.getenv("TURBOINDEX_HOST")
+    host, port_env, user, password, database, mysql_version, pool_size_env = env
+
     if host:
         cfg.host = host
 
-    port_env = os.getenv("TURBOINDEX_PORT")
     if port_env:
         try:
             cfg.port = int(port_env)
         except ValueError:
             pass
 
-    user = os.getenv("TURBOINDEX_USER")
     if user:
         cfg.user = user
 
-    password = os.getenv("TURBOINDEX_PASSWORD")
     if password is not None:
         cfg.password = password
 
-    database = os.getenv("TURBOINDEX_DATABASE")
     if database:
         cfg.database = database
 
-    mysql_version = os.getenv("TURBOINDEX_MYSQL_VERSION")
     if mysql_version:
         cfg.mysql_version = mysql_version
 
+    if pool_size_env:
+        try:
+            pool_size = int(pool_size_env)
+        except ValueError:
+            raise ValueError(
+                f"TURBOINDEX_POOL_SIZE must be an integer, got {pool_size_env!r}"
+            ) from None
+        cfg.pool_size = validate_pool_size(pool_size)
+
     return cfg
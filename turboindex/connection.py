@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import mysql.connector
+from .config import validate_pool_size
+
+if TYPE_CHECKING:  # pragma: no cover
+    from mysql.connector.pooling import PooledMySQLConnection
 
 
 @dataclass
@@ -13,19 +16,42 @@ class MySQLConnectionConfig:
     user: Optional[str] = None
     password: Optional[str] = None
     database: Optional[str] = None
+    pool_size: Optional[int] = None
 
 
-def connect(config: MySQLConnectionConfig) -> mysql.connector.MySQLConnection:
-    """Create a new MySQL connection from the given configuration.
+def connect(config: MySQLConnectionConfig) -> PooledMySQLConnection:
+    """Check out a pooled MySQL connection for the given configuration.
 
-    The caller is responsible for closing the returned connection.
+    Connections are shared per DSN for the lifetime of the process; the
+    caller is responsible for closing the returned connection, which hands
+    it back to the pool instead of disconnecting.
     """
 
-    conn = mysql.connector.connect(
-        host=config.host,
-        port=config.port,
-        user=config.user,
-        password=config.password,
-        database=config.database,
+    # Deferred so that importing this module does not load mysql.connector.
+    from .pool import DEFAULT_POOL_SIZE, get_pool
+
+    pool_size = DEFAULT_POOL_SIZE
+    if config.pool_size is not None:
+        pool_size = validate_pool_size(config.pool_size)
+    pool = get_pool(
+        config.host,
+        config.port,
+        config.user,
+        config.password,
+        config.database,
+        pool_size,
     )
-    return conn
+    return pool.get_connection()
+
+
+def get_server_version(conn: PooledMySQLConnection) -> Optional[str]:
+    """Return the server version string reported during the handshake.
+
+    This avoids a `SELECT VERSION()` round-trip on every run.
+    """
+
+    try:
+        info = conn.get_server_info()
+    except Exception:
+        return None
+    return str(info) if info else None
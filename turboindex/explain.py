@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import functools
+import re
+
+# Flags from the Extra column of EXPLAIN output, as bits of a mask.
+FILESORT = 1
+TEMPORARY = 2
+USING_WHERE = 4
+
+_EXTRA_RE = re.compile(
+    r"(?P<filesort>filesort)|(?P<temporary>temporary)|(?P<using_where>Using where)",
+    re.IGNORECASE,
+)
+_EXTRA_FLAGS = {"filesort": FILESORT, "temporary": TEMPORARY, "using_where": USING_WHERE}
+
+
+@functools.lru_cache(maxsize=512)
+def parse_extra(extra: str) -> int:
+    """Return the Extra flags as a bitfield.
+
+    Memoized because joined tables tend to repeat the same Extra text
+    (e.g. "Using where; Using index") across rows.
+    """
+
+    flags = 0
+    for match in _EXTRA_RE.finditer(extra):
+        flags |= _EXTRA_FLAGS[match.lastgroup]
+    return flags
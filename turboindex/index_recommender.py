@@ -1,21 +1,47 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from contextlib import closing
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-from .connection import MySQLConnectionConfig, connect
+from ._compat import FrozenSlots
+from .connection import MySQLConnectionConfig, connect, get_server_version
+from .explain import FILESORT, TEMPORARY, USING_WHERE, parse_extra
+from .plan_cache import QueryCache, cached_explain, server_identity
 
 
 @dataclass
 class IndexRecommendation:
+    __slots__ = ("table", "suggested_index_name", "columns", "reason")
+
     table: str
     suggested_index_name: str
     columns: List[str]
     reason: str
 
+    def as_dict(self) -> Dict[str, Any]:
+        # `columns` is shared rather than copied; the result is meant
+        # for serialization.
+        return {
+            "table": self.table,
+            "suggested_index_name": self.suggested_index_name,
+            "columns": self.columns,
+            "reason": self.reason,
+        }
+
+
+@dataclass(frozen=True)
+class IndexAnalysisResult(FrozenSlots):
+    __slots__ = (
+        "query",
+        "recommendations",
+        "explain_rows",
+        "mysql_version",
+        "server_version",
+        "health_score",
+        "issues",
+    )
 
-@dataclass
-class IndexAnalysisResult:
     query: str
     recommendations: List[IndexRecommendation]
     explain_rows: List[Dict[str, Any]]
@@ -27,7 +53,7 @@ class IndexAnalysisResult:
     def to_dict(self) -> Dict[str, Any]:
         return {
             "query": self.query,
-            "recommendations": [asdict(r) for r in self.recommendations],
+            "recommendations": [r.as_dict() for r in self.recommendations],
             "mysql_version": self.mysql_version,
             "server_version": self.server_version,
             "health_score": self.health_score,
@@ -36,48 +62,77 @@ class IndexAnalysisResult:
         }
 
 
-def _collect_explain(cursor, query: str) -> List[Dict[str, Any]]:
-    cursor.execute(f"EXPLAIN {query}")
-    columns = [col[0] for col in cursor.description]
-    results: List[Dict[str, Any]] = []
-    for row in cursor.fetchall():
-        results.append({col: value for col, value in zip(columns, row)})
-    return results
+def _collect_explain(
+    cursor,
+    query: str,
+    plan_cache: Optional[QueryCache] = None,
+    identity: str = "",
+) -> List[Dict[str, Any]]:
+    # Expects a dictionary cursor so the driver builds the row mappings.
+    return cached_explain(cursor, query, plan_cache, identity)
+
+
+# Column placeholder used until the filter column can be derived from the
+# SQL.
+_PLACEHOLDER_COLUMN = "<choose_filter_column>"
 
 
 def _suggest_index_name(table: str, columns: List[str]) -> str:
+    if len(columns) == 1:
+        return f"idx_{table}_{columns[0]}"
     cols_part = "_".join(columns[:3])
     return f"idx_{table}_{cols_part}"
 
 
-def _analyze_explain_for_indexes(explain_rows: List[Dict[str, Any]]) -> List[IndexRecommendation]:
+# Access types that affect the health score.
+_ACCESS_TYPE_PENALTIES = {
+    "all": (20, "Full table scan on {table} (type=ALL)"),
+    "index": (5, "Sequential index scan on {table} (type=index)"),
+}
+
+
+def _scan_explain(
+    explain_rows: List[Dict[str, Any]],
+) -> Tuple[List[IndexRecommendation], int, List[str]]:
+    """Walk the plan once, collecting recommendations and per-row deductions."""
+
     recommendations: List[IndexRecommendation] = []
+    issues: List[str] = []
+    score = 100
 
     for row in explain_rows:
         table = row.get("table")
-        access_type = str(row.get("type") or "").lower()
-        possible_keys = row.get("possible_keys")
-        key = row.get("key")
-        extra = str(row.get("Extra") or "")
+        access_type = str(row.get("type") or "").casefold()
+        flags = parse_extra(str(row.get("Extra") or ""))
+
+        penalty = _ACCESS_TYPE_PENALTIES.get(access_type)
+        if penalty is not None:
+            score -= penalty[0]
+            issues.append(penalty[1].format(table=table or "?"))
+
+        if flags & FILESORT:
+            score -= 10
+            issues.append(f"Filesort required for {table or '?'}")
+
+        if flags & TEMPORARY:
+            score -= 10
+            issues.append(f"Temporary table used for {table or '?'}")
 
         # Very simple heuristic for MVP:
         # - full table scan (type=ALL)
-        # - no index chosen
+        # - no index chosen and none considered
         # - has WHERE filtering (Using where)
-        if access_type == "all" and not key and "Using where" in extra:
-            where_columns: List[str] = []
-            # We do not yet attempt to fully parse the query; instead we
-            # just flag the table for review.
-            if possible_keys:
-                continue
-
-            if not table:
-                continue
-
+        if (
+            access_type == "all"
+            and flags & USING_WHERE
+            and table
+            and not row.get("key")
+            and not row.get("possible_keys")
+        ):
             # Assume a simple single-column index on the primary filter
             # column would help; we cannot know the column name without
             # parsing the SQL, so we emit a generic recommendation.
-            where_columns = ["<choose_filter_column>"]
+            where_columns = [_PLACEHOLDER_COLUMN]
 
             recommendations.append(
                 IndexRecommendation(
@@ -91,42 +146,14 @@ def _analyze_explain_for_indexes(explain_rows: List[Dict[str, Any]]) -> List[Ind
                 )
             )
 
-    return recommendations
+    return recommendations, score, issues
 
 
-def _compute_index_health(
-    explain_rows: List[Dict[str, Any]],
+def _finish_health(
+    score: int,
+    issues: List[str],
     recommendations: List[IndexRecommendation],
 ) -> Tuple[int, List[str]]:
-    """Compute a simple 0-100 index health score and list of issues.
-
-    This is intentionally conservative and based only on EXPLAIN output
-    for the current query plus the generated recommendations.
-    """
-
-    score = 100
-    issues: List[str] = []
-
-    for row in explain_rows:
-        table = row.get("table") or "?"
-        access_type = str(row.get("type") or "").lower()
-        extra = str(row.get("Extra") or "").lower()
-
-        if access_type == "all":
-            score -= 20
-            issues.append(f"Full table scan on {table} (type=ALL)")
-        elif access_type == "index":
-            score -= 5
-            issues.append(f"Sequential index scan on {table} (type=index)")
-
-        if "filesort" in extra:
-            score -= 10
-            issues.append(f"Filesort required for {table}")
-
-        if "temporary" in extra:
-            score -= 10
-            issues.append(f"Temporary table used for {table}")
-
     if recommendations:
         penalty = min(5 * len(recommendations), 20)
         score -= penalty
@@ -136,6 +163,20 @@ def _compute_index_health(
     return score, issues
 
 
+def _score_and_recommend(
+    explain_rows: List[Dict[str, Any]],
+) -> Tuple[List[IndexRecommendation], int, List[str]]:
+    """Derive recommendations and a 0-100 health score in a single pass.
+
+    The score is intentionally conservative and based only on EXPLAIN
+    output for the current query plus the generated recommendations.
+    """
+
+    recommendations, score, issues = _scan_explain(explain_rows)
+    score, issues = _finish_health(score, issues, recommendations)
+    return recommendations, score, issues
+
+
 def analyze_query_indexes(
     query: str,
     host: str,
@@ -144,6 +185,8 @@ def analyze_query_indexes(
     password: Optional[str],
     database: Optional[str],
     mysql_version: Optional[str] = None,
+    pool_size: Optional[int] = None,
+    plan_cache: Optional[QueryCache] = None,
 ) -> IndexAnalysisResult:
     config = MySQLConnectionConfig(
         host=host,
@@ -151,25 +194,21 @@ def analyze_query_indexes(
         user=user,
         password=password,
         database=database,
+        pool_size=pool_size,
     )
 
     with connect(config) as conn:
-        cursor = conn.cursor()
-
-        # Detect server version if possible
-        server_version: Optional[str] = None
-        try:
-            cursor.execute("SELECT VERSION()")
-            row = cursor.fetchone()
-            if row:
-                server_version = str(row[0])
-        except Exception:
-            server_version = None
-
-        explain_rows = _collect_explain(cursor, query)
-
-    recommendations = _analyze_explain_for_indexes(explain_rows)
-    health_score, issues = _compute_index_health(explain_rows, recommendations)
+        server_version = get_server_version(conn)
+
+        with closing(conn.cursor(dictionary=True)) as cursor:
+            explain_rows = _collect_explain(
+                cursor,
+                query,
+                plan_cache,
+                server_identity(host, port, database, server_version),
+            )
+
+    recommendations, health_score, issues = _score_and_recommend(explain_rows)
 
     return IndexAnalysisResult(
         query=query,
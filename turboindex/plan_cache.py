@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Table and index definitions of the tables a cached plan reads. Index
+# columns are included so that adding a recommended index invalidates the
+# plan. Only those tables are read, so a lookup stays cheap regardless of
+# how large the schema is.
+_TABLES_FINGERPRINT_SQL = (
+    "SELECT TABLE_SCHEMA, TABLE_NAME, CREATE_TIME, UPDATE_TIME, TABLE_ROWS, "
+    "NULL AS INDEX_NAME, NULL AS COLUMN_NAME, NULL AS SEQ_IN_INDEX "
+    "FROM information_schema.TABLES WHERE {where} "
+    "UNION ALL "
+    "SELECT TABLE_SCHEMA, TABLE_NAME, NULL, NULL, NULL, INDEX_NAME, COLUMN_NAME, SEQ_IN_INDEX "
+    "FROM information_schema.STATISTICS WHERE {where} "
+    "ORDER BY 1, 2, 6, 8"
+)
+_TABLE_MATCH_SQL = "(TABLE_SCHEMA = %s AND TABLE_NAME = %s)"
+
+# MySQL follows EXPLAIN with a note (code 1003) holding the query as the
+# optimizer sees it, with every table written as `schema`.`table`.
+# Column references have three parts, or two when they refer to a derived
+# table; the latter match too, and only widen the fingerprint.
+_EXPLAIN_NOTE_CODE = 1003
+_QUALIFIED_TABLE_RE = re.compile(r"(?<![.`])`((?:[^`]|``)+)`\.`((?:[^`]|``)+)`(?![.`])")
+
+Table = Tuple[str, str]
+# EXPLAIN rows, the tables they read and those tables' fingerprint.
+CachedPlan = Tuple[List[Dict[str, Any]], List[Table], str]
+
+
+def default_cache_path() -> Path:
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "turboindex" / "plans.sqlite"
+
+
+def normalize_sql(sql: str) -> str:
+    """Normalize query text for use in a cache key.
+
+    Literals are kept as-is: EXPLAIN row estimates depend on them, so two
+    queries differing only in constants must not share a cached plan.
+    """
+
+    return sql.strip().rstrip(";").rstrip()
+
+
+def plan_key(
+    sql: str,
+    identity: str,
+    params: Optional[Sequence[Any]] = None,
+) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(normalize_sql(sql).encode())
+    digest.update(b"\0")
+    if params:
+        digest.update(repr(tuple(params)).encode())
+        digest.update(b"\0")
+    digest.update(identity.encode())
+    return digest.hexdigest()
+
+
+def server_identity(
+    host: str,
+    port: int,
+    database: Optional[str],
+    server_version: Optional[str],
+) -> str:
+    return f"{host}:{port}/{database or ''}@{server_version or ''}"
+
+
+def explain_tables(cursor, rows: List[Dict[str, Any]]) -> Optional[List[Table]]:
+    """Return the (schema, table) pairs read by the EXPLAIN just run.
+
+    Must be called right after fetching the EXPLAIN rows. Returns None when
+    the server does not report them (e.g. MariaDB, which emits no note).
+    """
+
+    cursor.execute("SHOW WARNINGS")
+    notes = [
+        str(warning.get("Message") or "")
+        for warning in cursor.fetchall()
+        if warning.get("Code") == _EXPLAIN_NOTE_CODE
+    ]
+    tables = {
+        (schema.replace("``", "`"), table.replace("``", "`"))
+        for note in notes
+        for schema, table in _QUALIFIED_TABLE_RE.findall(note)
+    }
+    if not tables and any(row.get("table") for row in rows):
+        return None
+    return sorted(tables)
+
+
+def schema_fingerprint(cursor, tables: Sequence[Table]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    if tables:
+        where = " OR ".join([_TABLE_MATCH_SQL] * len(tables))
+        params = tuple(name for table in tables for name in table)
+        cursor.execute(_TABLES_FINGERPRINT_SQL.format(where=where), params + params)
+        for row in cursor.fetchall():
+            digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+class QueryCache:
+    """LRU cache of EXPLAIN rows persisted in a local SQLite file.
+
+    Each entry also stores the tables its plan reads and their fingerprint,
+    so that it can be validated against the current schema.
+
+    The cache is best effort: any filesystem, SQLite or decoding error is
+    treated as a miss so that profiling never fails because of it.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 512) -> None:
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path))
+            # Entries from before tables were stored cannot be validated.
+            db.execute("DROP TABLE IF EXISTS plans")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS plan_entries ("
+                "key TEXT PRIMARY KEY, rows TEXT NOT NULL, tables TEXT NOT NULL, "
+                "fingerprint TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def get(self, key: str) -> Optional[CachedPlan]:
+        """Return the cached rows, tables and fingerprint for `key`."""
+
+        try:
+            db = self._connect()
+            row = db.execute(
+                "SELECT rows, tables, fingerprint FROM plan_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            rows = json.loads(row[0])
+            tables = [(schema, table) for schema, table in json.loads(row[1])]
+            db.execute("UPDATE plan_entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+        except (OSError, sqlite3.Error, ValueError, TypeError):
+            return None
+        return rows, tables, row[2]
+
+    def put(
+        self,
+        key: str,
+        rows: List[Dict[str, Any]],
+        tables: Sequence[Table],
+        fingerprint: str,
+    ) -> None:
+        try:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO plan_entries "
+                "(key, rows, tables, fingerprint, last_used) VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(rows, default=str),
+                    json.dumps([list(table) for table in tables]),
+                    fingerprint,
+                    time.time(),
+                ),
+            )
+            db.execute(
+                "DELETE FROM plan_entries WHERE key NOT IN "
+                "(SELECT key FROM plan_entries ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            db.commit()
+        except (OSError, sqlite3.Error):
+            pass
+
+    def clear(self) -> None:
+        try:
+            db = self._connect()
+            db.execute("DELETE FROM plan_entries")
+            db.commit()
+        except (OSError, sqlite3.Error):
+            pass
+
+
+def cached_explain(
+    cursor,
+    query: str,
+    cache: Optional[QueryCache] = None,
+    identity: str = "",
+    params: Optional[Sequence[Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Run `EXPLAIN query` on a dictionary cursor, consulting `cache` first.
+
+    `params` are interpolated into `%s` placeholders by the driver. A
+    cached plan is used while the tables it reads are unchanged; plans
+    whose tables the server does not report are not cached.
+    """
+
+    key: Optional[str] = None
+    if cache is not None:
+        key = plan_key(query, identity, params)
+        cached = cache.get(key)
+        if cached is not None:
+            rows, tables, fingerprint = cached
+            try:
+                if schema_fingerprint(cursor, tables) == fingerprint:
+                    return rows
+            except Exception:
+                pass
+
+    cursor.execute(f"EXPLAIN {query}", tuple(params) if params else None)
+    rows = cursor.fetchall()
+    if cache is not None and key is not None:
+        try:
+            tables = explain_tables(cursor, rows)
+            if tables is not None:
+                cache.put(key, rows, tables, schema_fingerprint(cursor, tables))
+        except Exception:
+            pass
+    return rows
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import Dict, Optional, Tuple
+
+from mysql.connector import connect
+from mysql.connector.errors import Error, PoolError
+from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
+
+
+DEFAULT_POOL_SIZE = 10
+
+
+class _RollbackPool(MySQLConnectionPool):
+    """`MySQLConnectionPool` that ends a returned connection's transaction.
+
+    Connections default to autocommit=False and the pool does not reset
+    sessions, so a checked-in connection would otherwise keep its open
+    transaction: metadata and row locks on the profiled tables, and a
+    stale REPEATABLE READ snapshot for the next borrower.
+    """
+
+    def add_connection(self, cnx=None) -> None:
+        if cnx is not None:
+            try:
+                if cnx.in_transaction:
+                    cnx.rollback()
+            except Error:
+                # E.g. an unread result set. Disconnecting also ends the
+                # transaction; the pool reconnects it on the next checkout.
+                cnx.disconnect()
+        super().add_connection(cnx)
+
+
+class ConnectionPool:
+    """Lazily filled wrapper around `MySQLConnectionPool`.
+
+    `MySQLConnectionPool` opens `pool_size` connections as soon as it is
+    configured. TurboIndex usually needs a single connection per run, so
+    connections are only established when every pooled one is in use,
+    up to `pool_size` in total.
+    """
+
+    def __init__(self, pool_size: int, **connect_kwargs) -> None:
+        self._pool = _RollbackPool(
+            pool_name="turboindex",
+            pool_size=pool_size,
+            pool_reset_session=False,
+        )
+        self._pool.set_config(**connect_kwargs)
+        self._connect_kwargs = connect_kwargs
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool.pool_size
+
+    def get_connection(self) -> PooledMySQLConnection:
+        """Check out a connection; closing it hands it back to the pool.
+
+        `MySQLConnectionPool` pings a reused connection and reconnects it
+        when the server has dropped it, so stale connections are not
+        handed out.
+        """
+
+        with self._lock:
+            try:
+                return self._pool.get_connection()
+            except PoolError:
+                if self._opened >= self._pool.pool_size:
+                    raise
+            # Reserve the slot, then connect without holding the lock so
+            # that other threads can check out idle connections meanwhile.
+            self._opened += 1
+
+        try:
+            cnx = connect(**self._connect_kwargs)
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+        # Tag the connection like MySQLConnectionPool.add_connection() does;
+        # otherwise the pool reconnects it on its first reuse.
+        cnx.pool_config_version = getattr(self._pool, "_config_version", None)
+        # Closing the wrapper queues the connection in the pool.
+        return PooledMySQLConnection(self._pool, cnx)
+
+    def close(self) -> None:
+        """Disconnect idle connections; checked-out ones are left alone."""
+
+        with self._lock:
+            # _remove_connections() is private to mysql-connector-python;
+            # if a release drops it, drain the idle connections through the
+            # public API instead.
+            remove = getattr(self._pool, "_remove_connections", None)
+            if remove is not None:
+                self._opened -= remove()
+                return
+            while True:
+                try:
+                    pooled = self._pool.get_connection()
+                except PoolError:
+                    return
+                # Disconnect the underlying connection and drop the wrapper
+                # without close(), which would queue it again.
+                pooled.disconnect()
+                self._opened -= 1
+
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    host: str,
+    port: int,
+    user: Optional[str],
+    password: Optional[str],
+    database: Optional[str],
+    pool_size: int = DEFAULT_POOL_SIZE,
+) -> ConnectionPool:
+    """Return the process-wide pool for the given DSN, creating it on first use."""
+
+    key = (host, port, user, password, database, pool_size)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                pool_size=pool_size,
+                host=host,
+                port=port,
+                user=user,
+                password=password,
+                database=database,
+            )
+    return pool
+
+
+@atexit.register
+def close_pools() -> None:
+    """Disconnect the idle connections of every pool and forget the pools.
+
+    Runs at interpreter exit so the server sees a clean disconnect rather
+    than an aborted connection.
+    """
+
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -1,104 +1,148 @@
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
 
-from .connection import MySQLConnectionConfig, connect
+from ._compat import FrozenSlots
+from .connection import MySQLConnectionConfig, connect, get_server_version
+from .explain import FILESORT, TEMPORARY, parse_extra
+from .pool import DEFAULT_POOL_SIZE
+from .plan_cache import QueryCache, cached_explain, server_identity
 
 
 @dataclass
 class QueryExecutionSample:
+    __slots__ = ("iteration", "execution_time_ns", "rows_returned")
+
     iteration: int
-    execution_time_ms: float
+    execution_time_ns: int
     rows_returned: Optional[int]
 
+    @property
+    def execution_time_ms(self) -> float:
+        return self.execution_time_ns / 1e6
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "iteration": self.iteration,
+            "execution_time_ms": self.execution_time_ms,
+            "rows_returned": self.rows_returned,
+        }
+
 
 @dataclass
 class ExplainRow:
     raw: Dict[str, Any]
 
 
-@dataclass
-class QueryProfileResult:
+_FETCH_BATCH_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class QueryProfileResult(FrozenSlots):
+    # The underscored slots hold aggregates that are computed once in
+    # __post_init__ instead of on every property access.
+    __slots__ = (
+        "query",
+        "samples",
+        "explain_rows",
+        "mysql_version",
+        "server_version",
+        "_avg_ms",
+        "_avg_rows",
+        "_rows_examined",
+        "_flags",
+        "_index_usage",
+    )
+
     query: str
     samples: List[QueryExecutionSample]
     explain_rows: List[ExplainRow]
     mysql_version: Optional[str]
     server_version: Optional[str]
 
+    def __post_init__(self) -> None:
+        total_ns = 0
+        rows_total = 0
+        rows_count = 0
+        for sample in self.samples:
+            total_ns += sample.execution_time_ns
+            if sample.rows_returned is not None:
+                rows_total += sample.rows_returned
+                rows_count += 1
+
+        rows_examined = 0
+        flags = 0
+        index_usage: List[Dict[str, Any]] = []
+        for row in self.explain_rows:
+            raw = row.raw
+            try:
+                rows_examined += int(raw.get("rows") or 0)
+            except (TypeError, ValueError):
+                pass
+            flags |= parse_extra(str(raw.get("Extra") or ""))
+            key = raw.get("key")
+            if key:
+                index_usage.append({"index": key, "type": raw.get("type"), "rows": raw.get("rows")})
+
+        set_field = object.__setattr__
+        set_field(self, "_avg_ms", total_ns / len(self.samples) / 1e6 if self.samples else 0.0)
+        set_field(self, "_avg_rows", float(rows_total / rows_count) if rows_count else None)
+        set_field(self, "_rows_examined", rows_examined)
+        set_field(self, "_flags", flags)
+        set_field(self, "_index_usage", index_usage)
+
     @property
     def average_time_ms(self) -> float:
-        if not self.samples:
-            return 0.0
-        return sum(s.execution_time_ms for s in self.samples) / len(self.samples)
+        return self._avg_ms
 
     @property
     def estimated_rows_examined(self) -> int:
-        total = 0
-        for row in self.explain_rows:
-            try:
-                total += int(row.raw.get("rows") or 0)
-            except (TypeError, ValueError):
-                continue
-        return total
+        return self._rows_examined
 
     @property
     def uses_filesort(self) -> bool:
-        for row in self.explain_rows:
-            extra = str(row.raw.get("Extra") or "").lower()
-            if "filesort" in extra:
-                return True
-        return False
+        return bool(self._flags & FILESORT)
 
     @property
     def uses_temporary(self) -> bool:
-        for row in self.explain_rows:
-            extra = str(row.raw.get("Extra") or "").lower()
-            if "temporary" in extra:
-                return True
-        return False
+        return bool(self._flags & TEMPORARY)
 
     @property
     def average_rows_returned(self) -> Optional[float]:
-        values = [s.rows_returned for s in self.samples if s.rows_returned is not None]
-        if not values:
-            return None
-        return float(sum(values) / len(values))
+        return self._avg_rows
 
     @property
     def index_usage_summary(self) -> List[Dict[str, Any]]:
-        summary: List[Dict[str, Any]] = []
-        for row in self.explain_rows:
-            key = row.raw.get("key")
-            if not key:
-                continue
-            summary.append(
-                {
-                    "index": key,
-                    "type": row.raw.get("type"),
-                    "rows": row.raw.get("rows"),
-                }
-            )
-        return summary
+        return self._index_usage
 
     def to_dict(self) -> Dict[str, Any]:
+        avg_ms = self._avg_ms
+        avg_rows = self._avg_rows
+        rows_examined = self._rows_examined
+        uses_filesort = bool(self._flags & FILESORT)
+        uses_temporary = bool(self._flags & TEMPORARY)
+        index_usage = self._index_usage
+        samples = [s.as_dict() for s in self.samples]
         return {
             "query": self.query,
-            "samples": [asdict(s) for s in self.samples],
-            "average_time_ms": self.average_time_ms,
-            "average_rows_returned": self.average_rows_returned,
-            "estimated_rows_examined": self.estimated_rows_examined,
-            "uses_filesort": self.uses_filesort,
-            "uses_temporary": self.uses_temporary,
-            "index_usage": self.index_usage_summary,
+            "samples": samples,
+            "average_time_ms": avg_ms,
+            "average_rows_returned": avg_rows,
+            "estimated_rows_examined": rows_examined,
+            "uses_filesort": uses_filesort,
+            "uses_temporary": uses_temporary,
+            "index_usage": index_usage,
             "query_metrics": {
-                "execution_time_ms": self.average_time_ms,
-                "rows_examined": self.estimated_rows_examined,
-                "rows_returned": self.average_rows_returned,
-                "temp_tables_created": 1 if self.uses_temporary else 0,
-                "filesort_operations": 1 if self.uses_filesort else 0,
-                "index_usage": self.index_usage_summary,
+                "execution_time_ms": avg_ms,
+                "rows_examined": rows_examined,
+                "rows_returned": avg_rows,
+                "temp_tables_created": 1 if uses_temporary else 0,
+                "filesort_operations": 1 if uses_filesort else 0,
+                "index_usage": index_usage,
             },
             "mysql_version": self.mysql_version,
             "server_version": self.server_version,
@@ -106,13 +150,61 @@ class QueryProfileResult:
         }
 
 
-def _run_explain(cursor, query: str) -> List[ExplainRow]:
-    cursor.execute(f"EXPLAIN {query}")
-    columns = [col[0] for col in cursor.description]
-    rows = []
-    for db_row in cursor.fetchall():
-        rows.append(ExplainRow(raw={col: value for col, value in zip(columns, db_row)}))
-    return rows
+def _run_explain(
+    cursor,
+    query: str,
+    plan_cache: Optional[QueryCache] = None,
+    identity: str = "",
+    params: Optional[Sequence[Any]] = None,
+) -> List[ExplainRow]:
+    # Expects a dictionary cursor so the driver builds the row mappings.
+    rows = cached_explain(cursor, query, plan_cache, identity, params)
+    return [ExplainRow(raw=row) for row in rows]
+
+
+def _count_rows(cursor) -> Optional[int]:
+    """Drain the pending result set in batches, returning the row count."""
+
+    count = 0
+    try:
+        while batch := cursor.fetchmany(_FETCH_BATCH_SIZE):
+            count += len(batch)
+    except Exception:
+        return None
+    return count
+
+
+def _open_iteration_cursor(conn, prepared: bool):
+    if prepared:
+        return conn.cursor(prepared=True)
+    # Unbuffered and raw: rows are only counted, never converted or kept.
+    return conn.cursor(buffered=False, raw=True)
+
+
+def _timed_execution(cursor, query: str, bind, iteration: int) -> QueryExecutionSample:
+    start = time.perf_counter_ns()
+    cursor.execute(query, bind)
+    rows_returned = _count_rows(cursor)
+    elapsed_ns = time.perf_counter_ns() - start
+    return QueryExecutionSample(
+        iteration=iteration,
+        execution_time_ns=elapsed_ns,
+        rows_returned=rows_returned,
+    )
+
+
+def _run_iterations(
+    config: MySQLConnectionConfig,
+    query: str,
+    bind,
+    prepared: bool,
+    iterations: Sequence[int],
+) -> List[QueryExecutionSample]:
+    # One pooled connection per worker, so a prepared statement is reused
+    # across that worker's iterations.
+    with connect(config) as conn:
+        with closing(_open_iteration_cursor(conn, prepared)) as cursor:
+            return [_timed_execution(cursor, query, bind, i) for i in iterations]
 
 
 def profile_query(
@@ -124,11 +216,26 @@ def profile_query(
     database: Optional[str],
     iterations: int = 3,
     mysql_version: Optional[str] = None,
+    pool_size: Optional[int] = None,
+    plan_cache: Optional[QueryCache] = None,
+    params: Optional[Sequence[Any]] = None,
+    prepared: bool = False,
+    parallel: bool = False,
 ) -> QueryProfileResult:
     """Profile a query by executing it multiple times and collecting timings.
 
     This function intentionally keeps metrics simple for the MVP: execution
-    time, rows returned, and raw EXPLAIN output.
+    time, rows returned, and raw EXPLAIN output. When `plan_cache` is
+    given, EXPLAIN output is reused while the tables it reads are
+    unchanged.
+
+    `params` are bound to `%s` placeholders in `query`. With `prepared`,
+    iterations run as a server-side prepared statement that is parsed on
+    the first iteration only; that first sample includes the prepare.
+
+    With `parallel`, iterations are spread over up to `pool_size` pooled
+    connections. This shortens wall-clock time for read-only queries, but
+    concurrent executions can slow each other down, so timings are noisier.
     """
 
     config = MySQLConnectionConfig(
@@ -137,43 +244,48 @@ def profile_query(
         user=user,
         password=password,
         database=database,
+        pool_size=pool_size,
     )
 
     samples: List[QueryExecutionSample] = []
 
     with connect(config) as conn:
-        cursor = conn.cursor()
-
-        # Detect server version if possible
-        server_version: Optional[str] = None
-        try:
-            cursor.execute("SELECT VERSION()")
-            row = cursor.fetchone()
-            if row:
-                server_version = str(row[0])
-        except Exception:
-            server_version = None
-
-        # Run EXPLAIN once
-        explain_rows = _run_explain(cursor, query)
-
-        # Execute the query multiple times
-        for i in range(iterations):
-            start = time.perf_counter()
-            cursor.execute(query)
-            try:
-                rows = cursor.fetchall()
-                rows_returned = len(rows)
-            except Exception:
-                rows_returned = None
-            end = time.perf_counter()
-
-            samples.append(
-                QueryExecutionSample(
-                    iteration=i + 1,
-                    execution_time_ms=(end - start) * 1000.0,
-                    rows_returned=rows_returned,
+        server_version = get_server_version(conn)
+
+        # Run EXPLAIN once. Cursors are closed before the connection goes
+        # back to the pool, which also deallocates a prepared statement.
+        with closing(conn.cursor(dictionary=True)) as cursor:
+            explain_rows = _run_explain(
+                cursor,
+                query,
+                plan_cache,
+                server_identity(host, port, database, server_version),
+                params,
+            )
+
+        bind = tuple(params) if params else None
+        if not parallel:
+            with closing(_open_iteration_cursor(conn, prepared)) as cursor:
+                for i in range(iterations):
+                    samples.append(_timed_execution(cursor, query, bind, i + 1))
+
+    if parallel and iterations > 0:
+        workers = min(iterations, DEFAULT_POOL_SIZE if pool_size is None else pool_size)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _run_iterations,
+                    config,
+                    query,
+                    bind,
+                    prepared,
+                    range(worker + 1, iterations + 1, workers),
                 )
+                for worker in range(workers)
+            ]
+            samples = sorted(
+                (sample for future in futures for sample in future.result()),
+                key=lambda sample: sample.iteration,
             )
 
     return QueryProfileResult(
@@ -1,29 +1,53 @@
 from __future__ import annotations
 
 import csv
-import io
+import functools
 import json
-from typing import Any, Dict, List
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from rich.console import Console
-from rich.table import Table
+try:  # Optional: `pip install turboindex[fast]`
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
-from .profiler import QueryProfileResult
-from .rewriter import RewriteResult
-from .index_recommender import IndexAnalysisResult
+if TYPE_CHECKING:  # pragma: no cover
+    from rich.console import Console
 
+    from .index_recommender import IndexAnalysisResult
+    from .profiler import QueryProfileResult
+    from .rewriter import RewriteResult
 
-_console = Console()
+
+@functools.lru_cache(maxsize=None)
+def _get_console() -> Console:
+    # rich is only imported once console output is actually needed.
+    from rich.console import Console
+
+    return Console()
+
+
+def _dumps(obj: Any) -> str:
+    # Indentation is costly for large plans and only helps humans, so it
+    # is only used when writing to a terminal. Values the json module
+    # cannot encode (e.g. Decimal in EXPLAIN output) fall back to str().
+    # The json fallback is configured to print exactly what orjson does.
+    pretty = sys.stdout.isatty()
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(obj, option=option, default=str).decode()
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
 
 
 def output_profile_result(result: QueryProfileResult, fmt: str = "table") -> None:
     if fmt == "json":
-        print(json.dumps(result.to_dict(), indent=2))
+        print(_dumps(result.to_dict()))
         return
 
     if fmt == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(sys.stdout)
         writer.writerow(["iteration", "execution_time_ms", "rows_returned"])
         for sample in result.samples:
             writer.writerow(
@@ -33,28 +57,28 @@ def output_profile_result(result: QueryProfileResult, fmt: str = "table") -> Non
                     "" if sample.rows_returned is None else sample.rows_returned,
                 ]
             )
-        print(output.getvalue().rstrip("\n"))
         return
 
     if fmt == "html":
-        rows_html = []
+        out = sys.stdout
+        out.write(
+            "<table>"
+            "<thead><tr><th>Iteration</th><th>Time (ms)</th><th>Rows Returned</th></tr></thead>"
+            "<tbody>"
+        )
         for sample in result.samples:
-            rows_html.append(
+            out.write(
                 "<tr>"
                 f"<td>{sample.iteration}</td>"
                 f"<td>{sample.execution_time_ms:.4f}</td>"
                 f"<td>{'' if sample.rows_returned is None else sample.rows_returned}</td>"
                 "</tr>"
             )
-        html = (
-            "<table>"\
-            "<thead><tr><th>Iteration</th><th>Time (ms)</th><th>Rows Returned</th></tr></thead>"\
-            f"<tbody>{''.join(rows_html)}</tbody>"\
-            "</table>"\
-        )
-        print(html)
+        out.write("</tbody></table>\n")
         return
 
+    from rich.table import Table
+
     table = Table(title="Query Profile")
     table.add_column("Iteration", justify="right")
     table.add_column("Time (ms)", justify="right")
@@ -67,9 +91,10 @@ def output_profile_result(result: QueryProfileResult, fmt: str = "table") -> Non
             "-" if sample.rows_returned is None else str(sample.rows_returned),
         )
 
-    _console.print(table)
-    _console.print(f"Average time: {result.average_time_ms:.2f} ms")
-    _console.print(
+    console = _get_console()
+    console.print(table)
+    console.print(f"Average time: {result.average_time_ms:.2f} ms")
+    console.print(
         f"Estimated rows examined (from EXPLAIN): {result.estimated_rows_examined}"
     )
     if result.uses_filesort or result.uses_temporary:
@@ -78,42 +103,42 @@ def output_profile_result(result: QueryProfileResult, fmt: str = "table") -> Non
             flags.append("filesort")
         if result.uses_temporary:
             flags.append("temporary table")
-        _console.print("Execution flags: " + ", ".join(flags))
+        console.print("Execution flags: " + ", ".join(flags))
 
 
 def output_rewrite_result(result: RewriteResult, fmt: str = "diff") -> None:
     if fmt == "json":
-        print(json.dumps(result.to_dict(), indent=2))
+        print(_dumps(result.to_dict()))
         return
 
     # Simple textual diff-like output for MVP
-    _console.print("[bold]Original SQL:[/bold]")
-    _console.print(result.original_sql)
-    _console.print()
-    _console.print("[bold]Rewritten SQL:[/bold]")
-    _console.print(result.rewritten_sql)
-    _console.print()
+    console = _get_console()
+    console.print("[bold]Original SQL:[/bold]")
+    console.print(result.original_sql)
+    console.print()
+    console.print("[bold]Rewritten SQL:[/bold]")
+    console.print(result.rewritten_sql)
+    console.print()
 
     if result.changes:
-        _console.print("[bold]Changes applied:[/bold]")
+        console.print("[bold]Changes applied:[/bold]")
         for change in result.changes:
-            _console.print(f"- {change.description}")
+            console.print(f"- {change.description}")
     else:
-        _console.print("No changes were applied; query already conforms to rules for this mode.")
+        console.print("No changes were applied; query already conforms to rules for this mode.")
 
 
 def output_index_recommendations(result: IndexAnalysisResult, fmt: str = "table") -> None:
     if fmt == "json":
-        print(json.dumps(result.to_dict(), indent=2))
+        print(_dumps(result.to_dict()))
         return
 
     if not result.recommendations:
-        _console.print("No index recommendations based on current heuristics.")
+        _get_console().print("No index recommendations based on current heuristics.")
         return
 
     if fmt == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(sys.stdout)
         writer.writerow(["table", "index_name", "columns", "reason"])
         for rec in result.recommendations:
             writer.writerow(
@@ -124,13 +149,17 @@ def output_index_recommendations(result: IndexAnalysisResult, fmt: str = "table"
                     rec.reason,
                 ]
             )
-        print(output.getvalue().rstrip("\n"))
         return
 
     if fmt == "html":
-        rows_html = []
+        out = sys.stdout
+        out.write(
+            "<table>"
+            "<thead><tr><th>Table</th><th>Index Name</th><th>Columns</th><th>Reason</th></tr></thead>"
+            "<tbody>"
+        )
         for rec in result.recommendations:
-            rows_html.append(
+            out.write(
                 "<tr>"
                 f"<td>{rec.table}</td>"
                 f"<td>{rec.suggested_index_name}</td>"
@@ -138,15 +167,11 @@ def output_index_recommendations(result: IndexAnalysisResult, fmt: str = "table"
                 f"<td>{rec.reason}</td>"
                 "</tr>"
             )
-        html = (
-            "<table>"\
-            "<thead><tr><th>Table</th><th>Index Name</th><th>Columns</th><th>Reason</th></tr></thead>"\
-            f"<tbody>{''.join(rows_html)}</tbody>"\
-            "</table>"\
-        )
-        print(html)
+        out.write("</tbody></table>\n")
         return
 
+    from rich.table import Table
+
     table = Table(title="Index Recommendations")
     table.add_column("Table")
     table.add_column("Index Name")
@@ -161,9 +186,10 @@ def output_index_recommendations(result: IndexAnalysisResult, fmt: str = "table"
             rec.reason,
         )
 
-    _console.print(table)
-    _console.print(f"Index Health: {result.health_score}/100")
+    console = _get_console()
+    console.print(table)
+    console.print(f"Index Health: {result.health_score}/100")
     if result.issues:
-        _console.print("Issues detected:")
+        console.print("Issues detected:")
         for issue in result.issues:
-            _console.print(f"- {issue}")
+            console.print(f"- {issue}")
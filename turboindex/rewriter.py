@@ -1,65 +1,211 @@
 from __future__ import annotations
 
+import functools
 import re
-from dataclasses import dataclass, asdict
-from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
 
+from ._compat import FrozenSlots
 from .connection import MySQLConnectionConfig, connect
 
 
-@dataclass
-class RewriteChange:
+@dataclass(frozen=True)
+class RewriteChange(FrozenSlots):
+    __slots__ = ("description",)
+
     description: str
 
 
-@dataclass
-class RewriteResult:
+@dataclass(frozen=True)
+class RewriteResult(FrozenSlots):
+    # Results are immutable because rewrite_query() hands the same cached
+    # instance to every caller.
+    __slots__ = ("original_sql", "rewritten_sql", "mode", "changes")
+
     original_sql: str
     rewritten_sql: str
     mode: str
-    changes: List[RewriteChange]
+    changes: Tuple[RewriteChange, ...]
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "original_sql": self.original_sql,
             "rewritten_sql": self.rewritten_sql,
             "mode": self.mode,
-            "changes": [asdict(c) for c in self.changes],
+            "changes": [{"description": c.description} for c in self.changes],
         }
 
 
-def _rewrite_null_comparisons(sql: str, changes: List[RewriteChange]) -> str:
-    pattern_not_eq = re.compile(r"!=\s*NULL", re.IGNORECASE)
-    if pattern_not_eq.search(sql):
-        sql = pattern_not_eq.sub("IS NOT NULL", sql)
-        changes.append(RewriteChange(description="Replaced `!= NULL` with `IS NOT NULL`"))
-    pattern_eq = re.compile(r"=\s*NULL", re.IGNORECASE)
-    if pattern_eq.search(sql):
-        sql = pattern_eq.sub("IS NULL", sql)
-        changes.append(RewriteChange(description="Replaced `= NULL` with `IS NULL`"))
-    return sql
+# Modes that enable rules beyond the safe set, including schema-aware
+# rewrites in rewrite_query_with_connection().
+_HEAVY_MODES: FrozenSet[str] = frozenset(("moderate", "aggressive"))
+
+# Changes are immutable, so each rule reports the same shared instance.
+_CHANGE_NOT_EQ_NULL = RewriteChange(description="Replaced `!= NULL` with `IS NOT NULL`")
+_CHANGE_EQ_NULL = RewriteChange(description="Replaced `= NULL` with `IS NULL`")
+_CHANGE_OR_TO_IN = RewriteChange(description="Converted OR chain to IN() list")
+_CHANGE_SELECT_STAR = RewriteChange(description="Replaced SELECT * with explicit column list")
+_CHANGE_YEAR_RANGE = RewriteChange(
+    description="Rewrote YEAR() equality to date range predicate to allow index usage"
+)
+
+# Safe rules report what they applied as bits of a mask. The change
+# tuple for every possible mask is built once, in reporting order, so a
+# rewrite never grows a list of changes.
+_RULE_NOT_EQ_NULL = 1
+_RULE_EQ_NULL = 2
+_RULE_OR_TO_IN = 4
+_RULE_YEAR_RANGE = 8
+
+_RULE_CHANGES: Tuple[Tuple[int, RewriteChange], ...] = (
+    (_RULE_NOT_EQ_NULL, _CHANGE_NOT_EQ_NULL),
+    (_RULE_EQ_NULL, _CHANGE_EQ_NULL),
+    (_RULE_OR_TO_IN, _CHANGE_OR_TO_IN),
+    (_RULE_YEAR_RANGE, _CHANGE_YEAR_RANGE),
+)
+
+_MASK_TO_CHANGES: Tuple[Tuple[RewriteChange, ...], ...] = tuple(
+    tuple(change for bit, change in _RULE_CHANGES if mask & bit)
+    for mask in range(1 << len(_RULE_CHANGES))
+)
+
+# Patterns are compiled once at import rather than on every call. The
+# OR and YEAR() patterns are case-sensitive: they are matched against an
+# uppercased copy of the SQL (see _upper), which lets the regex engine
+# use its fast literal search for the WHERE and YEAR prefixes that
+# IGNORECASE disables. The NULL pattern starts with an operator, gains
+# nothing from that and keeps using a plain sub().
+_NULL_CMP_RE = re.compile(r"(!=|=)\s*NULL", re.IGNORECASE)
+_WHERE_RE = re.compile(r"WHERE\s+")
+_EQ_TERM_RE = re.compile(r"([\w\.]+)\s*=\s*([^\s();,]+)")
+_OR_SEP_RE = re.compile(r"\s+OR\s+")
+# What may follow a rewritten OR chain. AND (and XOR, and any operator)
+# binds tighter than OR, so `a = 1 OR a = 2 AND b = 3` must stay as is.
+_OR_CHAIN_END_RE = re.compile(r"\s*(?:$|[);]|(?:OR|GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|UNION)\b)")
+_SELECT_STAR_RE = re.compile(r"^\s*SELECT\s+\*\s+FROM\s+([A-Za-z0-9_]+)\b", re.IGNORECASE)
+_YEAR_EQ_RE = re.compile(r"YEAR\s*\(\s*([\w\.]+)\s*\)\s*=\s*(\d{4})")
+
+
+def _upper(sql: str) -> str:
+    """Uppercase `sql` without changing any character offsets."""
+
+    upper = sql.upper()
+    if len(upper) == len(sql):
+        return upper
+    # A few characters expand when uppercased (e.g. "ß" -> "SS"); they
+    # are kept as-is so that offsets into the copy still address `sql`.
+    return "".join(c.upper() if len(c.upper()) == 1 else c for c in sql)
+
+
+def _splice(
+    sql: str,
+    sql_upper: str,
+    pattern: Pattern[str],
+    repl: Callable[[re.Match], str],
+) -> str:
+    """Like `pattern.sub(repl, sql)`, but matching against `sql_upper`."""
+
+    parts: List[str] = []
+    last = 0
+    for match in pattern.finditer(sql_upper):
+        parts.append(sql[last:match.start()])
+        parts.append(repl(match))
+        last = match.end()
+    if not parts:
+        return sql
+    parts.append(sql[last:])
+    return "".join(parts)
+
+
+def _may_have_null_comparison(sql_upper: str) -> bool:
+    """Cheaply rule out SQL whose NULLs are all `IS NULL` / `IS NOT NULL`.
 
+    Most queries only use NULL that way. When every occurrence is
+    accounted for by those two spellings, none can follow `=` or `!=`,
+    and the regex is not needed. Anything else (including unusual
+    spacing) is left to the regex.
+    """
 
-def _rewrite_or_to_in(sql: str, changes: List[RewriteChange]) -> str:
-    # Very simple heuristic: WHERE col = 'a' OR col = 'b' OR col = 'c' -> WHERE col IN (...)
-    pattern = re.compile(
-        r"WHERE\s+([\w\.]+)\s*=\s*([^\s]+)\s+OR\s+\1\s*=\s*([^\s]+(?:\s+OR\s+\1\s*=\s*[^\s]+)*)",
-        re.IGNORECASE,
-    )
+    nulls = sql_upper.count("NULL")
+    return nulls != sql_upper.count("IS NULL") + sql_upper.count("IS NOT NULL")
+
+
+def _rewrite_null_comparisons(sql: str, sql_upper: str) -> Tuple[str, int]:
+    if not _may_have_null_comparison(sql_upper):
+        return sql, 0
+
+    # Both operators are rewritten in a single pass; `applied` records
+    # which of them occurred.
+    applied = 0
 
     def repl(match: re.Match) -> str:
-        column = match.group(1)
-        first_value = match.group(2)
-        rest = match.group(3)
-        values = [first_value]
-        for part in re.split(r"\s+OR\s+", rest, flags=re.IGNORECASE):
-            _col, _eq, _val = part.partition("=")
-            values.append(_val.strip())
-        in_list = ", ".join(values)
-        changes.append(RewriteChange(description="Converted OR chain to IN() list"))
-        return f"WHERE {column} IN ({in_list})"
+        nonlocal applied
+        if match.group(1) == "!=":
+            applied |= _RULE_NOT_EQ_NULL
+            return "IS NOT NULL"
+        applied |= _RULE_EQ_NULL
+        return "IS NULL"
+
+    sql = _NULL_CMP_RE.sub(repl, sql)
+    return sql, applied
+
 
-    return pattern.sub(repl, sql)
+def _scan_or_chain(
+    sql: str,
+    sql_upper: str,
+    pos: int,
+) -> Optional[Tuple[str, List[str], int]]:
+    """Scan `col = v1 OR col = v2 ...` starting at `pos`.
+
+    Returns the column, its values and the end offset of the chain, or
+    None when no comparison starts at `pos`. The chain stops at the first
+    term comparing a different column (compared case-insensitively).
+    Matching happens on `sql_upper`; the returned text is taken from `sql`.
+    """
+
+    term = _EQ_TERM_RE.match(sql_upper, pos)
+    if term is None:
+        return None
+    key = term.group(1)
+    column = sql[term.start(1):term.end(1)]
+    values = [sql[term.start(2):term.end(2)]]
+    end = term.end()
+    while True:
+        sep = _OR_SEP_RE.match(sql_upper, end)
+        if sep is None:
+            break
+        term = _EQ_TERM_RE.match(sql_upper, sep.end())
+        if term is None or term.group(1) != key:
+            break
+        values.append(sql[term.start(2):term.end(2)])
+        end = term.end()
+    return column, values, end
+
+
+def _rewrite_or_to_in(sql: str, sql_upper: str) -> Tuple[str, int]:
+    # Very simple heuristic: WHERE col = 'a' OR col = 'b' OR col = 'c' -> WHERE col IN (...)
+    # Each WHERE is followed by a single linear scan of its OR chain. The
+    # chain is only rewritten when it ends at a clause boundary.
+    parts: List[str] = []
+    last = 0
+    for where in _WHERE_RE.finditer(sql_upper):
+        if where.start() < last:
+            continue
+        chain = _scan_or_chain(sql, sql_upper, where.end())
+        if chain is None:
+            continue
+        column, values, end = chain
+        if len(values) < 2 or _OR_CHAIN_END_RE.match(sql_upper, end) is None:
+            continue
+        parts.append(sql[last:where.start()])
+        parts.append(f"WHERE {column} IN ({', '.join(values)})")
+        last = end
+
+    if not parts:
+        return sql, 0
+    parts.append(sql[last:])
+    return "".join(parts), _RULE_OR_TO_IN
 
 
 def _rewrite_select_star_with_columns(
@@ -73,17 +219,24 @@ def _rewrite_select_star_with_columns(
     column resolver or a stub in tests.
     """
 
-    pattern = re.compile(
-        r"^\s*SELECT\s+\*\s+FROM\s+([A-Za-z0-9_]+)\b(.*)$",
-        re.IGNORECASE | re.DOTALL,
-    )
-
-    match = pattern.match(sql)
+    # Sniff the first few characters before running the regex; most
+    # statements are not a bare SELECT * and are rejected here. Leading
+    # whitespace can push the keyword past the window, so a head that is
+    # too short to hold SELECT, or ends right after it, is left to the
+    # regex.
+    head = sql[:32].lstrip()
+    if len(head) >= 6:
+        if head[:6].upper() != "SELECT":
+            return sql
+        rest = head[6:].lstrip()
+        if rest and rest[0] != "*":
+            return sql
+
+    match = _SELECT_STAR_RE.match(sql)
     if not match:
         return sql
 
     table = match.group(1)
-    tail = match.group(2)
 
     try:
         columns = get_columns_for_table(table)
@@ -94,11 +247,28 @@ def _rewrite_select_star_with_columns(
         return sql
 
     explicit_list = ", ".join(columns)
-    changes.append(RewriteChange(description="Replaced SELECT * with explicit column list"))
-    return f"SELECT {explicit_list} FROM {table}{tail}"
+    changes.append(_CHANGE_SELECT_STAR)
+    return f"SELECT {explicit_list} FROM {table}{sql[match.end():]}"
+
+
+# Formatted range bounds keyed by the year's four matched digits, so a
+# hit needs neither int() nor formatting. Queries use a handful of
+# distinct years, so this stays small.
+_YEAR_BOUNDS: Dict[str, Tuple[str, str]] = {}
+
+
+def _year_bounds(year_digits: str) -> Tuple[str, str]:
+    bounds = _YEAR_BOUNDS.get(year_digits)
+    if bounds is None:
+        year = int(year_digits)
+        bounds = _YEAR_BOUNDS[year_digits] = (
+            f"'{year:04d}-01-01'",
+            f"'{year + 1:04d}-01-01'",
+        )
+    return bounds
 
 
-def _rewrite_year_function_on_column(sql: str, changes: List[RewriteChange]) -> str:
+def _rewrite_year_function_on_column(sql: str, sql_upper: str) -> Tuple[str, int]:
     """Rewrite YEAR(date_col) = 2024 to a sargable range predicate.
 
     Example:
@@ -110,28 +280,27 @@ def _rewrite_year_function_on_column(sql: str, changes: List[RewriteChange]) ->
     MySQL to use an index on the underlying column.
     """
 
-    pattern = re.compile(
-        r"YEAR\s*\(\s*([\w\.]+)\s*\)\s*=\s*(\d{4})",
-        re.IGNORECASE,
-    )
-
     def repl(match: re.Match) -> str:
-        column = match.group(1)
-        year_str = match.group(2)
-        year = int(year_str)
-        start = f"'{year:04d}-01-01'"
-        end = f"'{year + 1:04d}-01-01'"
-        changes.append(
-            RewriteChange(
-                description=(
-                    "Rewrote YEAR() equality to date range predicate "
-                    "to allow index usage"
-                )
-            )
-        )
+        column = sql[match.start(1):match.end(1)]
+        start, end = _year_bounds(match.group(2))
         return f"{column} >= {start} AND {column} < {end}"
 
-    return pattern.sub(repl, sql)
+    rewritten = _splice(sql, sql_upper, _YEAR_EQ_RE, repl)
+    return rewritten, (_RULE_YEAR_RANGE if rewritten is not sql else 0)
+
+
+# Safe rules in application order, each with uppercase keywords that
+# must all occur in the SQL for the rule to possibly apply. The keyword
+# check is a plain substring search that rules out most queries without
+# running any regex; a rule that passes it scans the SQL only once, in
+# its own substitution, rather than after a separate detection pass.
+# Rules receive the current SQL together with its _upper() copy and
+# return the rewritten SQL with the mask of changes they applied.
+_SAFE_RULES: Tuple[Tuple[Callable[[str, str], Tuple[str, int]], Tuple[str, ...]], ...] = (
+    (_rewrite_null_comparisons, ("NULL",)),
+    (_rewrite_or_to_in, ("WHERE", "OR")),
+    (_rewrite_year_function_on_column, ("YEAR",)),
+)
 
 
 def rewrite_query(sql: str, mode: str = "safe") -> RewriteResult:
@@ -140,20 +309,49 @@ def rewrite_query(sql: str, mode: str = "safe") -> RewriteResult:
     For the MVP we focus on a small, safe subset of transformations
     (NULL handling and OR->IN). More complex rules can be layered in
     future versions and gated by the `mode`.
+
+    Rewriting is deterministic, so results for recently seen queries
+    are cached and shared between callers.
     """
 
-    mode = mode.lower()
-    changes: List[RewriteChange] = []
-    rewritten = sql
+    return _rewrite_query_cached(sql, mode.lower())
+
+
+@functools.lru_cache(maxsize=1024)
+def _rewrite_query_cached(sql: str, mode: str) -> RewriteResult:
+    # Safe rules. The SQL is uppercased once up front, and again only
+    # after a rule has changed it and a later rule needs the copy.
+    sql_upper = _upper(sql)
+    candidates = [
+        rule
+        for rule, keywords in _SAFE_RULES
+        if all(keyword in sql_upper for keyword in keywords)
+    ]
+    if not candidates:
+        # Most queries contain no trigger keyword at all. Returning here
+        # also skips the moderate/aggressive block below, which is a no-op
+        # today.
+        return RewriteResult(
+            original_sql=sql,
+            rewritten_sql=sql,
+            mode=mode,
+            changes=_MASK_TO_CHANGES[0],
+        )
 
-    # Safe rules
-    rewritten = _rewrite_null_comparisons(rewritten, changes)
-    rewritten = _rewrite_or_to_in(rewritten, changes)
-    rewritten = _rewrite_year_function_on_column(rewritten, changes)
+    mask = 0
+    rewritten = sql
+    rewritten_upper: Optional[str] = sql_upper
+    for rule in candidates:
+        if rewritten_upper is None:
+            rewritten_upper = _upper(rewritten)
+        result, applied = rule(rewritten, rewritten_upper)
+        if applied:
+            mask |= applied
+            rewritten, rewritten_upper = result, None
 
     # Placeholders for future moderate/aggressive rules.
     # In MVP they intentionally do nothing but allow the CLI flag.
-    if mode in {"moderate", "aggressive"}:
+    if mode in _HEAVY_MODES:
         # TODO: implement additional rules like subquery-to-JOIN, JOIN reordering, etc.
         pass
 
@@ -161,22 +359,123 @@ def rewrite_query(sql: str, mode: str = "safe") -> RewriteResult:
         original_sql=sql,
         rewritten_sql=rewritten,
         mode=mode,
-        changes=changes,
+        changes=_MASK_TO_CHANGES[mask],
     )
 
 
+def _is_safe_identifier(name: str) -> bool:
+    # Non-empty and only [A-Za-z0-9_], checked with C-level str methods.
+    # (A `^...$` regex would also accept a trailing newline.)
+    return name.isascii() and name.replace("_", "a").isalnum()
+
+
 def _get_columns_for_table_from_db(
     config: MySQLConnectionConfig,
     table: str,
 ) -> List[str]:
     # Protect against obviously unsafe identifiers.
-    if not re.match(r"^[A-Za-z0-9_]+$", table):
+    if not _is_safe_identifier(table):
         return []
 
     with connect(config) as conn:
         cursor = conn.cursor()
         cursor.execute(f"SHOW COLUMNS FROM `{table}`")
-        return [row[0] for row in cursor.fetchall()]
+        # Iterating the cursor reads rows as they arrive instead of
+        # materializing them all with fetchall() first.
+        return [row[0] for row in cursor]
+
+
+@functools.lru_cache(maxsize=256)
+def _columns_cached(
+    host: str,
+    port: int,
+    user: Optional[str],
+    password: Optional[str],
+    database: Optional[str],
+    table: str,
+    pool_size: Optional[int] = None,
+) -> Tuple[str, ...]:
+    config = MySQLConnectionConfig(
+        host=host,
+        port=port,
+        user=user,
+        password=password,
+        database=database,
+        pool_size=pool_size,
+    )
+    return tuple(_get_columns_for_table_from_db(config, table))
+
+
+# Columns loaded by prefetch_columns(), keyed by DSN and table. Consulted
+# before _columns_cached so that prefetched tables need no round trip, and
+# bounded the same way: least recently used entries are evicted first.
+_PREFETCHED_COLUMNS_MAX = 256
+_ColumnsKey = Tuple[str, int, Optional[str], Optional[str], Optional[str], str]
+_prefetched_columns: OrderedDict[_ColumnsKey, Tuple[str, ...]] = OrderedDict()
+
+_PREFETCH_COLUMNS_SQL = (
+    "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS "
+    "WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders}) "
+    "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+)
+
+
+def prefetch_columns(config: MySQLConnectionConfig, tables: Iterable[str]) -> None:
+    """Load the columns of several tables with a single query.
+
+    Intended for batches of rewrites: prefetching the tables referenced by
+    the batch replaces one `SHOW COLUMNS` round trip per table. Tables
+    that are not found are left to the per-table lookup.
+
+    This is library API only; the CLI rewrites a single query and does
+    not call it.
+    """
+
+    names = sorted({table for table in tables if _is_safe_identifier(table)})
+    if not names or not config.database:
+        return
+
+    host = config.host or "localhost"
+    port = config.port or 3306
+    sql = _PREFETCH_COLUMNS_SQL.format(placeholders=", ".join(["%s"] * len(names)))
+    found: Dict[str, List[str]] = {}
+    with connect(config) as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, (config.database, *names))
+        for table, column in cursor:
+            found.setdefault(table, []).append(column)
+
+    for table, columns in found.items():
+        key = (host, port, config.user, config.password, config.database, table)
+        _prefetched_columns[key] = tuple(columns)
+        _prefetched_columns.move_to_end(key)
+    while len(_prefetched_columns) > _PREFETCHED_COLUMNS_MAX:
+        _prefetched_columns.popitem(last=False)
+
+
+def _table_columns(
+    host: str,
+    port: int,
+    user: Optional[str],
+    password: Optional[str],
+    database: Optional[str],
+    table: str,
+    pool_size: Optional[int] = None,
+) -> List[str]:
+    key = (host, port, user, password, database, table)
+    columns = _prefetched_columns.get(key)
+    if columns is None:
+        columns = _columns_cached(host, port, user, password, database, table, pool_size)
+    else:
+        _prefetched_columns.move_to_end(key)
+    return list(columns)
+
+
+def clear_column_cache() -> None:
+    """Forget cached table columns, e.g. after a schema change."""
+
+    _prefetched_columns.clear()
+    _columns_cached.cache_clear()
 
 
 def rewrite_query_with_connection(
@@ -187,6 +486,7 @@ def rewrite_query_with_connection(
     user: Optional[str],
     password: Optional[str],
     database: Optional[str],
+    pool_size: Optional[int] = None,
 ) -> RewriteResult:
     """Rewrite a query using both pure-SQL rules and schema-aware rules.
 
@@ -197,30 +497,28 @@ def rewrite_query_with_connection(
     """
 
     base_result = rewrite_query(sql=sql, mode=mode)
-    if mode.lower() not in {"moderate", "aggressive"}:
+    if mode.lower() not in _HEAVY_MODES:
         return base_result
 
     if not database:
         return base_result
 
-    config = MySQLConnectionConfig(
-        host=host or "localhost",
-        port=port or 3306,
-        user=user,
-        password=password,
-        database=database,
-    )
+    host = host or "localhost"
+    port = port or 3306
 
+    # Column lists are cached per DSN and table for the whole process
+    # (see prefetch_columns); call clear_column_cache() after changing the
+    # schema.
     changes = list(base_result.changes)
     rewritten = _rewrite_select_star_with_columns(
         base_result.rewritten_sql,
         changes,
-        lambda table: _get_columns_for_table_from_db(config, table),
+        lambda table: _table_columns(host, port, user, password, database, table, pool_size),
     )
 
     return RewriteResult(
         original_sql=sql,
         rewritten_sql=rewritten,
         mode=mode.lower(),
-        changes=changes,
+        changes=tuple(changes),
     )